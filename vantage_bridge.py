@@ -8,6 +8,7 @@ Version 1.1.1-SniperFix
 """
 
 import asyncio
+import functools
 import json
 import logging
 import os
@@ -16,14 +17,25 @@ import signal
 import socket
 import ssl
 import time
-from typing import Any, Dict, List, Optional, Set, Tuple
-from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
+from operator import attrgetter
 
-import psutil
 from aiomqtt import Client, Message, Will, TLSParameters
 from aiovantage import Vantage
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - optional speedup
+    uvloop = None
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Load .env
 # ─────────────────────────────────────────────────────────────────────────────
@@ -44,7 +56,23 @@ root_logger.setLevel(ROOT_LEVEL)
 for h in list(root_logger.handlers):
     root_logger.removeHandler(h)
 
-formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that runs strftime once per second instead of once per record."""
+
+    _last_sec = -1
+    _last_str = ""
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        sec = int(record.created)
+        if sec != self._last_sec:
+            self._last_str = time.strftime(self.default_time_format, self.converter(sec))
+            self._last_sec = sec
+        return self.default_msec_format % (self._last_str, record.msecs)
+
+
+formatter = _CachedTimeFormatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 console = logging.StreamHandler()
 console.setLevel(ROOT_LEVEL)
 console.setFormatter(formatter)
@@ -75,6 +103,9 @@ BASE_TOPIC = os.getenv("BASE_TOPIC", "vantage")
 DISCOVERY_PREFIX = os.getenv("DISCOVERY_PREFIX", "homeassistant")
 
 AVAILABILITY_TOPIC = f"{BASE_TOPIC}/bridge/status"
+# Home Assistant's birth/last-will topic; "online" means it has (re)started
+HA_STATUS_TOPIC = f"{DISCOVERY_PREFIX}/status"
+DIAGNOSTICS_TOPIC = f"{BASE_TOPIC}/diagnostics/state"
 BRIDGE_DEVICE_ID = f"vantage_controller_{VANTAGE_HOST_SAFE}"
 
 # --- TUNING ---
@@ -86,32 +117,173 @@ POLL_QUIET_TIME = 5 # Reduced to 5s so Sniper can fire quickly after a scene
 
 # THROTTLE: 0.02s delay to prevent crashes
 COMMAND_THROTTLE_DELAY = 0.02
+# Commands that may go out back-to-back before the throttle delay applies
+COMMAND_BURST = 5
+
+# Brightness commands for the same load within this window collapse to the last one
+BRIGHTNESS_DEBOUNCE = 0.03
+
+# Max publishes handed to aiomqtt in one gather() by the publisher task
+PUBLISH_BATCH_SIZE = 64
+
+# Pending keypad/task edges; further edges are dropped while the consumer catches up
+KEYPAD_EVENT_QUEUE_SIZE = 256
+
+# Keypad triggers remembered as announced (LRU); older ones are re-announced on next use
+KEYPAD_DISCOVERED_MAX = 4096
+
+# Send buffer for the MQTT socket (Nagle is disabled, see _tune_mqtt_socket)
+MQTT_SNDBUF = 64 * 1024
+
+# Inbound light command topics: <base>/light/<id>/set and <base>/light/<id>/brightness/set
+_CMD_TOPIC_RE = re.compile(rf"^{re.escape(BASE_TOPIC)}/light/(\d+)/(set|brightness/set)$")
+
+# Fields of the DIAGNOSTICS_TOPIC payload exposed as HA sensors: (key, name, unit, icon)
+DIAGNOSTIC_SENSORS = (
+    ("cpu_usage_pct", "CPU Usage", "%", "mdi:cpu-64-bit"),
+    ("memory_usage_mb", "Memory Usage", "MB", "mdi:memory"),
+    ("uptime_s", "Uptime", "s", "mdi:timer-outline"),
+    ("messages_published_total", "Messages Published", None, "mdi:counter"),
+    ("entity_count", "Entity Count", None, "mdi:lightbulb-group"),
+)
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Helpers
 # ─────────────────────────────────────────────────────────────────────────────
 
+try:
+    _CLK_TCK = os.sysconf("SC_CLK_TCK")
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):  # Non-POSIX; /proc sampling is unused there
+    _CLK_TCK, _PAGE_SIZE = 100, 4096
+
+
+# Conversion tables: HA brightness (0-255) -> Vantage level, Vantage level (0-100) -> HA brightness
+_B2L = tuple((i / 255.0) * 100.0 for i in range(256))
+_L2B = tuple(int(round((i / 100.0) * 255.0)) for i in range(101))
+# Pre-encoded payloads so paho never has to encode the common ones
+_BRI_PAYLOAD = tuple(str(i).encode() for i in range(256))  # indexed by HA brightness
+_B_ON, _B_OFF = b"ON", b"OFF"
+_B_PRESS, _B_RELEASE = b"press", b"release"
+_B_ONLINE, _B_OFFLINE = b"online", b"offline"
+
+
 def ha_to_vantage_level(brightness: int) -> float:
+    if type(brightness) is int and 0 <= brightness <= 255:
+        return _B2L[brightness]
     try:
         bri = int(brightness)
     except (TypeError, ValueError):
         bri = 0
-    bri = max(0, min(255, bri))
-    return (bri / 255.0) * 100.0
+    return _B2L[max(0, min(255, bri))]
 
 
 def vantage_to_ha_brightness(level: float) -> int:
+    if type(level) is int and 0 <= level <= 100:
+        return _L2B[level]
     try:
         lvl = float(level)
     except (TypeError, ValueError):
         lvl = 0.0
     lvl = max(0.0, min(100.0, lvl))
+    if lvl.is_integer():
+        return _L2B[int(lvl)]
     return int(round((lvl / 100.0) * 255.0))
 
 
+def json_bytes(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def mqtt_socket(client: Client) -> Optional[socket.socket]:
+    """The TCP socket under an aiomqtt client (via its paho client), if connected."""
+    try:
+        sock = client._client.socket()
+    except Exception:
+        return None
+    return sock if hasattr(sock, "setsockopt") else None
+
+
+class TokenBucket:
+    """Async token bucket: `capacity` immediate acquisitions, then `rate` per second."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+
+    async def acquire(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+        # Take the token before sleeping; a negative balance queues concurrent callers in order
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+
+def publish_qos0(client: Client, topic: str, payload: Any, retain: bool = False) -> None:
+    """Fire-and-forget QoS 0 publish through the paho client, skipping aiomqtt's per-message future."""
+    info = client._client.publish(topic, payload, qos=0, retain=retain)
+    if info.rc != 0:  # paho MQTT_ERR_SUCCESS
+        raise RuntimeError(f"paho publish failed (rc={info.rc})")
+
+
+def _tune_mqtt_socket(client: Client) -> bool:
+    """Disable Nagle so small PUBLISH frames go out immediately; False if no socket yet."""
+    sock = mqtt_socket(client)
+    if sock is None:
+        return False
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, MQTT_SNDBUF)
+    except OSError as e:
+        log.debug(f"Could not tune MQTT socket: {e}")
+    return True
+
+
+def read_proc_stats() -> Optional[Tuple[int, int]]:
+    """Return (utime+stime clock ticks, RSS bytes) for this process from /proc, or None off Linux."""
+    try:
+        with open("/proc/self/stat", "rb") as f:
+            stat = f.read()
+        with open("/proc/self/statm", "rb") as f:
+            rss_pages = int(f.read().split()[1])
+        # comm (field 2) may contain spaces; fields after ")" start at field 3 (state)
+        fields = stat[stat.rindex(b")") + 2:].split()
+        ticks = int(fields[11]) + int(fields[12])
+    except (OSError, ValueError, IndexError):
+        return None
+    return ticks, rss_pages * _PAGE_SIZE
+
+
+def _psutil_process() -> Optional[Any]:
+    """psutil handle for platforms without /proc; None if psutil is not installed."""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process(os.getpid())
+
+
+class _SlugTable(dict):
+    """str.translate table: keep [a-z0-9], map every other code point to '_'."""
+
+    def __missing__(self, key: int) -> int:
+        return 0x5F
+
+
+_SLUG_TABLE = _SlugTable({ord(c): ord(c) for c in "abcdefghijklmnopqrstuvwxyz0123456789"})
+_SLUG_RUN_RE = re.compile(r"_+")
+
+
+@functools.lru_cache(maxsize=1024)
 def slugify(name: str) -> str:
-    s = (name or "").lower()
-    s = re.sub(r"[^a-z0-9]+", "_", s).strip("_")
+    s = _SLUG_RUN_RE.sub("_", (name or "").lower().translate(_SLUG_TABLE)).strip("_")
     return s or "load"
 
 
@@ -119,12 +291,43 @@ def slugify(name: str) -> str:
 # Aiovantage "tap" logging handler
 # ─────────────────────────────────────────────────────────────────────────────
 
+_TAP_METHODS = frozenset({"Button.GetState", "Task.IsRunning"})
+
+# Exact working regex from v1.0.8
+_EL_RE = re.compile(r"EL:\s+(\d+)\s+([\w\.]+)\s+(-?\d+)")
+
+
+def _may_contain_el(record: logging.LogRecord) -> bool:
+    """Cheap pre-check on the raw record so non-EL lines skip %-formatting."""
+    raw = record.msg
+    if not isinstance(raw, str) or "EL:" in raw:
+        return True
+    args = record.args
+    if not args:
+        return False
+    if not isinstance(args, tuple):
+        args = (args,)
+    for a in args:
+        if isinstance(a, str):
+            if "EL:" in a:
+                return True
+        elif isinstance(a, (bytes, bytearray)):
+            if b"EL:" in a:
+                return True
+        elif not isinstance(a, (int, float)):
+            return True
+    return False
+
+
 class _AiovantageTapHandler(logging.Handler):
     def __init__(self, bridge: "KeypadEventsBridge"):
         super().__init__(level=logging.DEBUG)
         self.bridge = bridge
 
     def emit(self, record: logging.LogRecord) -> None:
+        if not _may_contain_el(record):
+            return
+
         try:
             msg = record.getMessage()
         except Exception:
@@ -141,6 +344,29 @@ class _AiovantageTapHandler(logging.Handler):
             pass
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Attribute readers for aiovantage objects
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _attr_reader(**defaults: Any):
+    """Read several attributes in one attrgetter call, with per-name defaults if any is missing."""
+    getter = attrgetter(*defaults)
+    items = tuple(defaults.items())
+
+    def read(obj: Any) -> Tuple[Any, ...]:
+        try:
+            return getter(obj)
+        except AttributeError:
+            return tuple(getattr(obj, name, default) for name, default in items)
+
+    return read
+
+
+_read_button = _attr_reader(location=None, vid=None, parent=None)
+_read_task = _attr_reader(parent=None, name="Virtual Task", area_id=0)
+_read_station = _attr_reader(vid=None, name=None, area_id=0)
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Keypad Events Bridge (With Sniper Trigger Re-Added)
 # ─────────────────────────────────────────────────────────────────────────────
@@ -159,6 +385,7 @@ class KeypadEventsBridge:
         learn_mode: bool = True,
         include_stations: Optional[Set[int]] = None,
         publish_raw: bool = True,
+        area_map: Optional[Dict[int, str]] = None,
     ):
         self.vantage = vantage
         self.get_mqtt_client = get_mqtt_client
@@ -169,24 +396,34 @@ class KeypadEventsBridge:
         self.include_stations = include_stations
         self.publish_raw = publish_raw
 
-        self._discovered: Set[Tuple[int, int, str]] = set()
+        self._discovered: "OrderedDict[Tuple[Any, Any, str], None]" = OrderedDict()
         self._loop = asyncio.get_running_loop()
-        self._area_map: Dict[int, str] = {}
-        
-        # Exact working regex from v1.0.8
-        self._regex = re.compile(r"EL:\s+(\d+)\s+([\w\.]+)\s+(-?\d+)")
+        # Shared with VantageBridge when provided, so areas are enumerated once per connection
+        self._owns_area_map = area_map is None
+        self._area_map: Dict[int, str] = {} if area_map is None else area_map
+
+        # Static per-source data, resolved on the first tap of each vid
+        self._tap_info: Dict[int, Optional[Tuple[str, str, str, Any, Any, str]]] = {}
+        self._raw_tmpl: Dict[int, bytes] = {}
+        self._raw_topic = f"{self.base_prefix}/keypad/_raw"
+
         self._tap_handler: Optional[_AiovantageTapHandler] = None
+        self._event_q: "asyncio.Queue[Tuple[int, str, int]]" = asyncio.Queue(maxsize=KEYPAD_EVENT_QUEUE_SIZE)
+        self._consumer_task: Optional[asyncio.Task] = None
+        # In-flight discovery publishes; held here so the consumer never awaits a PUBACK
+        self._disc_tasks: Set[asyncio.Task] = set()
 
     async def start(self) -> None:
         log.info("Starting Keypad Bridge (Silent Tap Mode)...")
         await self.vantage.buttons.initialize(fetch_state=True)
         await self.vantage.tasks.initialize(fetch_state=True)
 
-        try:
-            for area in self.vantage.areas:
-                self._area_map[area.id] = area.name
-        except Exception:
-            pass
+        if self._owns_area_map:
+            try:
+                for area in self.vantage.areas:
+                    self._area_map[area.id] = area.name
+            except Exception:
+                pass
 
         # SAFE LOGGING HIJACK
         aio_log = logging.getLogger("aiovantage")
@@ -195,30 +432,72 @@ class KeypadEventsBridge:
         aio_log.propagate = False
         aio_log.setLevel(logging.DEBUG)
 
+        self._consumer_task = self._loop.create_task(self._event_consumer())
         self._tap_handler = _AiovantageTapHandler(self)
         aio_log.addHandler(self._tap_handler)
 
         log.info(f"Keypad Bridge active.")
 
+    async def stop(self) -> None:
+        if self._tap_handler:
+            logging.getLogger("aiovantage").removeHandler(self._tap_handler)
+            self._tap_handler = None
+        if self._consumer_task:
+            self._consumer_task.cancel()
+            try: await self._consumer_task
+            except asyncio.CancelledError: pass
+            self._consumer_task = None
+        for task in list(self._disc_tasks):
+            task.cancel()
+        self._disc_tasks.clear()
+
+    async def _event_consumer(self) -> None:
+        while True:
+            vid, method, val = await self._event_q.get()
+            try:
+                await self._handle_tap_event(vid, method, val)
+            except Exception as e:
+                log.error(f"Error handling keypad event {vid}: {e}", exc_info=True)
+
     def _handle_el_line(self, msg: str) -> None:
-        try:
-            match = self._regex.search(msg)
-            if not match:
-                return
+        # Only button/task edges are forwarded; skip the regex for everything else
+        if "Button.GetState" not in msg and "Task.IsRunning" not in msg:
+            return
 
-            vid = int(match.group(1))
-            method = match.group(2)
-            val = int(match.group(3))
+        idx = msg.find("EL:")
+        if idx < 0:
+            return
 
-            if method in ["Button.GetState", "Task.IsRunning"]:
-                self._loop.create_task(self._handle_tap_event(vid, method, val))
+        try:
+            # Fixed "EL: <vid> <method> <val>" layout: split is cheaper than the regex,
+            # but only taken when the fields are exactly what _EL_RE would accept
+            parts = msg[idx + 3:].split(None, 3) if msg[idx + 3:idx + 4].isspace() else ()
+            if (
+                len(parts) >= 3
+                and parts[0].isdecimal()
+                and parts[1] in _TAP_METHODS
+                and parts[2].removeprefix("-").isdecimal()
+            ):
+                vid, method, val = int(parts[0]), parts[1], int(parts[2])
+            else:
+                # Unusual spacing/suffixes: fall back to the regex, starting at the EL: marker
+                match = _EL_RE.search(msg, idx)
+                if not match:
+                    return
+                vid = int(match.group(1))
+                method = match.group(2)
+                val = int(match.group(3))
+
+            if method in _TAP_METHODS:
+                self._event_q.put_nowait((vid, method, val))
+        except asyncio.QueueFull:
+            log.debug(f"Keypad event queue full; dropping {method} for {vid}")
         except Exception:
             pass
 
-    async def _handle_tap_event(self, vid, method, val) -> None:
-        mqtt = self.get_mqtt_client()
-        if not mqtt:
-            return
+    def _resolve_tap_source(self, vid: int) -> Optional[Tuple[str, str, str, Any, Any, str]]:
+        if vid in self._tap_info:
+            return self._tap_info[vid]
 
         obj = self.vantage.buttons.get(vid)
         source_type = "button"
@@ -227,35 +506,65 @@ class KeypadEventsBridge:
             source_type = "task"
 
         if not obj:
-            return
+            return None
 
-        station = getattr(obj, "parent", None)
-        station_id = getattr(station, "vid", None) or getattr(station, "id", 0) if station else 0
-        if not isinstance(station_id, int):
-            station_id = 0
+        if source_type == "task":
+            station, task_name, area_id = _read_task(obj)
+        else:
+            location, obj_vid, station = _read_button(obj)
 
-        station_name = "Unknown"
-        suggested_area = ""
-        pos = vid
+        station_id, station_name, station_area_id = 0, None, 0
+        if station:
+            s_vid, station_name, station_area_id = _read_station(station)
+            station_id = s_vid or getattr(station, "id", 0)
+            if not isinstance(station_id, int):
+                station_id = 0
 
         if source_type == "task":
             pos = vid
-            station_name = getattr(obj, "name", "Virtual Task")
-            area_id = getattr(obj, "area_id", 0)
-            suggested_area = self._area_map.get(area_id, "")
+            station_name = task_name
         else:
-            pos = getattr(obj, "location", None) or getattr(obj, "vid", vid)
-            station_name = f"Keypad {station_id}"
-            if station and hasattr(station, "name"):
-                station_name = station.name
-            area_id = getattr(station, "area_id", 0) if station else 0
-            suggested_area = self._area_map.get(area_id, "")
+            pos = location or obj_vid or vid
+            if station_name is None:
+                station_name = f"Keypad {station_id}"
+            area_id = station_area_id
+        suggested_area = self._area_map.get(area_id, "")
 
         if self.include_stations and source_type == "button" and station_id not in self.include_stations:
+            self._tap_info[vid] = None
+            return None
+
+        target_id = station_id if station_id != 0 else f"task_{vid}"
+        topic = f"{self.base_prefix}/keypad/{target_id}/button/{pos}/action"
+
+        # Bake the static fields into the _raw payload; only action/val vary per tap.
+        # Names are user data and go through %-formatting again, so escape their '%'.
+        s_type, s_name, s_area, s_pos = (
+            json_bytes(v).replace(b"%", b"%%") for v in (source_type, station_name, suggested_area, pos)
+        )
+        self._raw_tmpl[vid] = b'{"type":%s,"name":%s,"area":%s,"id":%d,"pos":%s,"action":"%%s","val":%%d}' % (
+            s_type, s_name, s_area, vid, s_pos
+        )
+
+        info = (source_type, station_name, suggested_area, pos, target_id, topic)
+        self._tap_info[vid] = info
+        return info
+
+    async def _handle_tap_event(self, vid, method, val) -> None:
+        mqtt = self.get_mqtt_client()
+        if not mqtt:
             return
 
-        action = "press" if val == 1 else "release" if val == 0 else "unknown"
-        if action == "unknown":
+        info = self._resolve_tap_source(vid)
+        if not info:
+            return
+        source_type, station_name, suggested_area, pos, target_id, topic = info
+
+        if val == 1:
+            action, action_b = "press", _B_PRESS
+        elif val == 0:
+            action, action_b = "release", _B_RELEASE
+        else:
             return
 
         # --- SNIPER LOGIC RESTORED ---
@@ -266,35 +575,40 @@ class KeypadEventsBridge:
         # -----------------------------
 
         if self.publish_raw:
-            raw_topic = f"{self.base_prefix}/keypad/_raw"
-            raw_payload = {
-                "type": source_type,
-                "name": station_name,
-                "area": suggested_area,
-                "id": vid,
-                "pos": pos,
-                "action": action,
-                "val": val,
-            }
             try:
-                await mqtt.publish(raw_topic, json.dumps(raw_payload), qos=0)
-            except Exception:
-                pass
-
-        target_id = station_id if station_id != 0 else f"task_{vid}"
-        topic = f"{self.base_prefix}/keypad/{target_id}/button/{pos}/action"
+                publish_qos0(mqtt, self._raw_topic, self._raw_tmpl[vid] % (action_b, val))
+            except Exception as e:
+                log.debug(f"Raw keypad publish failed for {vid}: {e}")
 
         try:
-            await mqtt.publish(topic, action, qos=0)
+            publish_qos0(mqtt, topic, action_b)
             log.debug(f"EVENT: {station_name} Btn:{pos} -> {action}")
         except Exception:
             pass
 
-        if self.learn_mode and (target_id, pos, action) not in self._discovered:
-            await self._publish_disc(mqtt, target_id, station_name, suggested_area, pos, topic, action, source_type)
-            self._discovered.add((target_id, pos, action))
+        if self.learn_mode:
+            key = (target_id, pos, action)
+            if key in self._discovered:
+                self._discovered.move_to_end(key)
+            else:
+                task = self._loop.create_task(
+                    self._publish_disc(mqtt, target_id, station_name, suggested_area, pos, topic, action, source_type)
+                )
+                self._disc_tasks.add(task)
+                task.add_done_callback(self._disc_tasks.discard)
+                self._discovered[key] = None
+                # Evicted triggers are simply re-announced (retained config) on their next tap
+                if len(self._discovered) > KEYPAD_DISCOVERED_MAX:
+                    self._discovered.popitem(last=False)
 
     async def _publish_disc(self, mqtt, uid, name, area, pos, topic, action, stype) -> None:
+        disc_topic, payload = self._build_disc(uid, name, area, pos, topic, action, stype)
+        try:
+            await mqtt.publish(disc_topic, payload, qos=1, retain=True)
+        except Exception:
+            pass
+
+    def _build_disc(self, uid, name, area, pos, topic, action, stype) -> Tuple[str, bytes]:
         dev_id = f"vantage_kp_{uid}"
         subtype = f"{stype}_{pos}"
         disc_topic = f"{self.discovery_prefix}/device_automation/{dev_id}_{subtype}_{action}/config"
@@ -316,16 +630,24 @@ class KeypadEventsBridge:
                 "via_device": BRIDGE_DEVICE_ID,
             },
         }
-        try:
-            await mqtt.publish(disc_topic, json.dumps(payload), qos=1, retain=True)
-        except Exception:
-            pass
+        return disc_topic, json_bytes(payload)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Main Bridge
 # ─────────────────────────────────────────────────────────────────────────────
 
+@dataclass(slots=True)
+class LoadTopics:
+    """MQTT topics for one load, built once at discovery."""
+    state: str
+    bri_state: str
+    set_: str
+    bri_set: str
+    attr: str
+    config: Optional[str]
+
+
 class VantageBridge:
     def __init__(self):
         self._loop = asyncio.get_event_loop()
@@ -334,6 +656,8 @@ class VantageBridge:
         self._mqtt_client: Optional[Client] = None
         self._mqtt_connected = False
         self._mqtt_task: Optional[asyncio.Task] = None
+        self._pub_q: "asyncio.Queue[Tuple[str, Any, int, bool]]" = asyncio.Queue()
+        self._publisher_task: Optional[asyncio.Task] = None
         self._keypad_bridge: Optional[KeypadEventsBridge] = None
         self._loads: Dict[int, Any] = {}
         self._is_dimmable: Dict[int, bool] = {}
@@ -341,22 +665,57 @@ class VantageBridge:
         self._area_names: Dict[int, str] = {}
         self._modules: Dict[int, Any] = {}
         self._last_non_zero_level: Dict[int, float] = {}
+        self._last_published: Dict[int, Tuple[bytes, Optional[int]]] = {}
+        self._load_topics: Dict[int, LoadTopics] = {}
+        self._disc_cache: Dict[int, Tuple[str, bytes]] = {}
+        self._attr_cache: Dict[int, Tuple[str, bytes]] = {}
+        self._bridge_disc: Optional[List[Tuple[str, bytes]]] = None
         self._start_time = time.monotonic()
-        self._process = psutil.Process(os.getpid())
+        # Diagnostics sample /proc directly on Linux; psutil is only the fallback
+        self._proc_prev: Optional[Tuple[int, float]] = None
+        self._process = None if read_proc_stats() else _psutil_process()
         self._total_publishes = 0
         self._last_event_time = time.monotonic()
         self._health_task: Optional[asyncio.Task] = None
         self._poll_task: Optional[asyncio.Task] = None
-        
+        self._poll_safety_task: Optional[asyncio.Task] = None
+        self._poll_lock = asyncio.Lock()
+        self._cmd_bucket = TokenBucket(rate=1.0 / COMMAND_THROTTLE_DELAY, capacity=COMMAND_BURST)
+        self._pending_level: Dict[int, float] = {}
+        self._pending_task: Dict[int, asyncio.Task] = {}
+        # Strong refs until each debounced write (sleep + controller call) completes
+        self._level_tasks: Set[asyncio.Task] = set()
+
         # EVENT FOR SNIPER POLLING
         self._poll_trigger = asyncio.Event()
 
+        # Inbound command dispatch, keyed by the matched topic suffix
+        self._cmd_dispatch = {
+            "set": self._handle_onoff_cmd,
+            "brightness/set": self._handle_brightness_cmd,
+        }
+
     def _ha_config_topic(self, component, object_id):
         return f"{DISCOVERY_PREFIX}/{component}/{BASE_TOPIC}/{object_id}/config"
 
     def _topic(self, *parts):
         return f"{BASE_TOPIC}/{'/'.join(map(str, parts))}"
 
+    def _light_topics(self, load_id: int) -> LoadTopics:
+        topics = self._load_topics.get(load_id)
+        if topics is None:
+            prefix = f"{BASE_TOPIC}/light/{load_id}"
+            oid = self._obj_id_map.get(load_id)
+            topics = self._load_topics[load_id] = LoadTopics(
+                state=f"{prefix}/state",
+                bri_state=f"{prefix}/brightness/state",
+                set_=f"{prefix}/set",
+                bri_set=f"{prefix}/brightness/set",
+                attr=f"{prefix}/attributes",
+                config=self._ha_config_topic("light", oid) if oid else None,
+            )
+        return topics
+
     def get_mqtt_client(self) -> Optional[Client]:
         if self._mqtt_connected and self._mqtt_client:
             return self._mqtt_client
@@ -371,7 +730,7 @@ class VantageBridge:
         while not self._shutdown_requested:
             try:
                 tls_params = TLSParameters(tls_version=ssl.PROTOCOL_TLSv1_2) if MQTT_TLS_ENABLED else None
-                will = Will(topic=AVAILABILITY_TOPIC, payload=b"offline", qos=1, retain=True)
+                will = Will(topic=AVAILABILITY_TOPIC, payload=_B_OFFLINE, qos=1, retain=True)
 
                 async with Client(
                     hostname=MQTT_HOST,
@@ -382,18 +741,25 @@ class VantageBridge:
                     tls_params=tls_params,
                 ) as client:
                     log.info(f"MQTT connected to {MQTT_HOST}:{MQTT_PORT}")
+                    socket_tuned = _tune_mqtt_socket(client)
                     self._mqtt_client = client
                     self._mqtt_connected = True
+                    # State publishes are not retained; force the next poll to resend everything
+                    self._last_published.clear()
 
-                    await self._publish_async(AVAILABILITY_TOPIC, "online", qos=1, retain=True)
+                    await self._publish_async(AVAILABILITY_TOPIC, _B_ONLINE, qos=1, retain=True)
 
                     if self._loads:
                         await self._publish_all_discovery_async()
 
                     await client.subscribe(self._topic("light", "+", "set"), qos=1)
                     await client.subscribe(self._topic("light", "+", "brightness", "set"), qos=1)
+                    await client.subscribe(HA_STATUS_TOPIC, qos=1)
 
                     async for message in client.messages:
+                        if not socket_tuned:
+                            socket_tuned = True
+                            _tune_mqtt_socket(client)
                         try:
                             await self._handle_mqtt_message_async(message)
                         except Exception as e:
@@ -407,55 +773,114 @@ class VantageBridge:
 
     async def _publish_async(self, topic, payload, retain=False, qos=0):
         if self._mqtt_client and self._mqtt_connected:
-            try:
-                await self._mqtt_client.publish(topic, payload, qos=qos, retain=retain)
+            self._pub_q.put_nowait((topic, payload, qos, retain))
+
+    def _publish_batch(self, items: Iterable[Tuple[str, Any, int, bool]]):
+        """Enqueue many (topic, payload, qos, retain) items with a single connection check."""
+        if not self.get_mqtt_client(): return
+        put = self._pub_q.put_nowait
+        for item in items:
+            put(item)
+
+    async def _publisher_loop(self):
+        """Drain the publish queue, handing bursts to aiomqtt in one gather()."""
+        while True:
+            batch = [await self._pub_q.get()]
+            while len(batch) < PUBLISH_BATCH_SIZE and not self._pub_q.empty():
+                batch.append(self._pub_q.get_nowait())
+
+            client = self.get_mqtt_client()
+            if not client:
+                continue  # Disconnected: drop, discovery/state republish on reconnect
+
+            # QoS 0 goes straight to paho; only QoS 1+ needs aiomqtt's completion future.
+            # Queue order is kept: a run of QoS 1 items is flushed before the next QoS 0
+            # item, so e.g. light configs reach HA ahead of the (non-retained) state.
+            acked: List[Tuple[str, Any]] = []
+            for topic, payload, qos, retain in batch:
+                if qos:
+                    acked.append((topic, client.publish(topic, payload, qos=qos, retain=retain)))
+                    continue
+                if acked:
+                    await self._flush_acked(acked)
+                    acked = []
+                try:
+                    publish_qos0(client, topic, payload, retain)
+                    self._total_publishes += 1
+                except Exception as e:
+                    log.error(f"MQTT publish error on {topic}: {e}")
+            if acked:
+                await self._flush_acked(acked)
+
+    async def _flush_acked(self, acked: List[Tuple[str, Any]]):
+        """Gather a run of QoS 1+ publishes; gather() starts them in order."""
+        results = await asyncio.gather(*(coro for _, coro in acked), return_exceptions=True)
+        for (topic, _), res in zip(acked, results):
+            if isinstance(res, Exception):
+                log.error(f"MQTT publish error on {topic}: {res}")
+            else:
                 self._total_publishes += 1
-            except Exception as e:
-                log.error(f"MQTT publish error on {topic}: {e}")
 
     async def _handle_mqtt_message_async(self, message: Message):
         topic = str(message.topic)
-        payload = message.payload.decode("utf-8", "ignore").strip()
-        parts = topic.split("/")
+        m = _CMD_TOPIC_RE.match(topic)
+        if not m:
+            if topic == HA_STATUS_TOPIC and message.payload == _B_ONLINE:
+                await self._resync_home_assistant()
+            return
 
         try:
-            if len(parts) >= 4 and parts[0] == BASE_TOPIC and parts[1] == "light":
-                load_id = int(parts[2])
-                load_obj = self._loads.get(load_id)
-                if not load_obj:
-                    return
-
-                # Brightness set
-                if len(parts) >= 5 and parts[3] == "brightness" and parts[4] == "set":
-                    level = 0.0
-                    try:
-                        bri = int(payload)
-                        level = ha_to_vantage_level(bri)
-                        if level > 0:
-                            self._last_non_zero_level[load_id] = level
-                    except ValueError:
-                        if payload.upper() == "ON":
-                            level = self._last_non_zero_level.get(load_id, 100.0)
-                        else:
-                            return
-                    await self._set_level(load_id, level, load_obj)
-                    return
-
-                # Simple ON/OFF set
-                if len(parts) == 4 and parts[3] == "set":
-                    command = payload.upper()
-                    if command == "ON":
-                        level = self._last_non_zero_level.get(load_id, 100.0)
-                        await self._set_level(load_id, level, load_obj)
-                    elif command == "OFF":
-                        await load_obj.turn_off()
-                        await self._publish_load_state_async(load_id, 0.0)
-                        # Throttle OFF commands too
-                        await asyncio.sleep(COMMAND_THROTTLE_DELAY)
-
+            load_id = int(m[1])
+            load_obj = self._loads.get(load_id)
+            if not load_obj:
+                return
+            # ON/OFF and integer brightness payloads are plain ASCII
+            payload = message.payload.decode("ascii", "ignore").strip()
+            await self._cmd_dispatch[m[2]](load_id, load_obj, payload)
         except Exception as e:
             log.error(f"Error parsing MQTT cmd: {e}", exc_info=True)
 
+    async def _handle_brightness_cmd(self, load_id: int, load_obj: Any, payload: str):
+        level = 0.0
+        try:
+            bri = int(payload)
+            level = ha_to_vantage_level(bri)
+            if level > 0:
+                self._last_non_zero_level[load_id] = level
+        except ValueError:
+            if payload.upper() == "ON":
+                level = self._last_non_zero_level.get(load_id, 100.0)
+            else:
+                return
+        # Slider drags arrive as a stream; only the latest level in the window is sent
+        self._pending_level[load_id] = level
+        if load_id not in self._pending_task:
+            task = self._pending_task[load_id] = asyncio.create_task(self._coalesce_level(load_id, load_obj))
+            self._level_tasks.add(task)
+            task.add_done_callback(self._level_tasks.discard)
+
+    async def _coalesce_level(self, load_id: int, load_obj: Any):
+        try:
+            await asyncio.sleep(BRIGHTNESS_DEBOUNCE)
+        finally:
+            self._pending_task.pop(load_id, None)
+        level = self._pending_level.pop(load_id, None)
+        if level is not None:
+            await self._set_level(load_id, level, load_obj)
+
+    async def _handle_onoff_cmd(self, load_id: int, load_obj: Any, payload: str):
+        command = payload.upper()
+        if command == "ON":
+            level = self._last_non_zero_level.get(load_id, 100.0)
+            await self._set_level(load_id, level, load_obj)
+        elif command == "OFF":
+            # A pending slider level must not turn the load back on after OFF
+            self._pending_level.pop(load_id, None)
+            # Throttle OFF commands too
+            await self._throttle()
+            await load_obj.turn_off()
+            await self._publish_load_state_async(load_id, 0.0)
+
     # ─────────────────────────────────────────────────────────────────────
     # Load Control & Discovery
     # ─────────────────────────────────────────────────────────────────────
@@ -473,25 +898,30 @@ class VantageBridge:
         for area in self._vantage.areas: self._area_names[area.id] = area.name
         await self._vantage.loads.initialize()
         self._loads.clear()
+        self._load_topics.clear()
         self._last_non_zero_level.clear()
-        grouped_loads: Dict[str, List[Any]] = defaultdict(list)
-        for load in self._vantage.loads:
-            self._loads[load.id] = load
-            self._is_dimmable[load.id] = bool(getattr(load, "is_dimmable", True))
-            if load.level and load.level > 0: self._last_non_zero_level[load.id] = load.level
-            grouped_loads[slugify(getattr(load, "name", "load"))].append(load)
         self._obj_id_map.clear()
-        for base_name, loads in grouped_loads.items():
-            loads.sort(key=lambda x: x.id)
-            for i, load in enumerate(loads):
-                oid = base_name if i == 0 else f"{base_name}_{i + 1}"
-                if "fan" in (load.name or "").lower(): oid += "_load"
-                self._obj_id_map[load.id] = oid
-        await self._publish_bridge_device_async()
-        for l in self._loads.values():
-            await self._publish_discovery_for_load_async(l)
-            await self._publish_attributes_for_load_async(l)
-            await self._publish_load_state_async(l.id, l.level or 0.0)
+        # One tuple sort orders by (slug, id); ids are unique so loads are never compared
+        named_loads = sorted((slugify(getattr(l, "name", "load")), l.id, l) for l in self._vantage.loads)
+        prev_slug, idx = None, 0
+        for base_name, load_id, load in named_loads:
+            self._loads[load_id] = load
+            self._is_dimmable[load_id] = bool(getattr(load, "is_dimmable", True))
+            if load.level and load.level > 0: self._last_non_zero_level[load_id] = load.level
+            idx = idx + 1 if base_name == prev_slug else 0
+            prev_slug = base_name
+            oid = base_name if idx == 0 else f"{base_name}_{idx + 1}"
+            if "fan" in (load.name or "").lower(): oid += "_load"
+            self._obj_id_map[load_id] = oid
+        for load_id in self._loads: self._light_topics(load_id)
+        # Discovery/attribute payloads only change when names or areas do, i.e. on rediscovery
+        self._disc_cache.clear()
+        self._attr_cache.clear()
+        for load in self._loads.values():
+            entry = self._build_load_discovery(load)
+            if entry: self._disc_cache[load.id] = entry
+            self._attr_cache[load.id] = self._build_load_attributes(load)
+        await self._publish_all_discovery_async(with_state=True)
         log.info(f"Discovered {len(self._loads)} loads.")
 
     async def _handle_load_event(self, event=None, load=None, data=None, *args, **kwargs):
@@ -510,6 +940,9 @@ class VantageBridge:
             try: self._vantage.loads.subscribe("state_change", self._handle_load_event)
             except Exception: pass
 
+    async def _throttle(self):
+        await self._cmd_bucket.acquire()
+
     async def _set_level(self, load_id: int, level: float, load: Optional[Any] = None):
         if not self._vantage: return
         try:
@@ -518,10 +951,10 @@ class VantageBridge:
             if not load: return
             level = max(0.0, min(100.0, float(level)))
             log.info(f"Setting load {load_id} to {level:.1f}%")
+            await self._throttle()
             await load.set_level(level)
             if level > 0: self._last_non_zero_level[load_id] = level
             await self._publish_load_state_async(load_id, level)
-            await asyncio.sleep(COMMAND_THROTTLE_DELAY)
         except Exception as e:
             log.error(f"Error setting level: {e}", exc_info=True)
 
@@ -531,52 +964,86 @@ class VantageBridge:
     
     async def _publish_bridge_offline_async(self):
         try:
-            will = Will(AVAILABILITY_TOPIC, b"offline", qos=1, retain=True)
+            will = Will(AVAILABILITY_TOPIC, _B_OFFLINE, qos=1, retain=True)
             async with Client(hostname=MQTT_HOST, port=MQTT_PORT, username=MQTT_USERNAME, password=MQTT_PASSWORD, will=will) as client:
-                await client.publish(AVAILABILITY_TOPIC, "offline", qos=1, retain=True)
+                await client.publish(AVAILABILITY_TOPIC, _B_OFFLINE, qos=1, retain=True)
         except Exception: pass
 
     async def _publish_bridge_device_async(self):
         try:
-            oid = f"{BRIDGE_DEVICE_ID}_status"
-            topic = self._ha_config_topic("sensor", oid)
+            if self._bridge_disc is None:
+                self._bridge_disc = self._build_bridge_device()
+            self._publish_batch((topic, payload, 1, True) for topic, payload in self._bridge_disc)
+        except Exception: pass
+
+    def _build_bridge_device(self) -> List[Tuple[str, bytes]]:
+        configs = []
+        oid = f"{BRIDGE_DEVICE_ID}_status"
+        topic = self._ha_config_topic("sensor", oid)
+        payload = {
+            "name": "Bridge Status",
+            "default_entity_id": f"sensor.{oid}",
+            "unique_id": f"{BRIDGE_DEVICE_ID}_status_sensor",
+            "state_topic": AVAILABILITY_TOPIC,
+            "json_attributes_topic": DIAGNOSTICS_TOPIC,
+            "icon": "mdi:bridge",
+            "device": {
+                "identifiers": [BRIDGE_DEVICE_ID],
+                "name": f"Vantage Controller ({VANTAGE_HOST})",
+                "manufacturer": "Vantage",
+                "model": "InFusion (SDK) Bridge",
+                "sw_version": "1.1.1-SniperFix",
+            },
+            "entity_category": "diagnostic",
+        }
+        configs.append((topic, json_bytes(payload)))
+
+        # One sensor per field of the combined diagnostics payload
+        for key, name, unit, icon in DIAGNOSTIC_SENSORS:
+            oid = f"{BRIDGE_DEVICE_ID}_{key}"
             payload = {
-                "name": "Bridge Status",
+                "name": name,
                 "default_entity_id": f"sensor.{oid}",
-                "unique_id": f"{BRIDGE_DEVICE_ID}_status_sensor",
-                "state_topic": AVAILABILITY_TOPIC,
-                "icon": "mdi:bridge",
-                "device": {
-                    "identifiers": [BRIDGE_DEVICE_ID],
-                    "name": f"Vantage Controller ({VANTAGE_HOST})",
-                    "manufacturer": "Vantage",
-                    "model": "InFusion (SDK) Bridge",
-                    "sw_version": "1.1.1-SniperFix",
-                },
+                "unique_id": f"{oid}_sensor",
+                "state_topic": DIAGNOSTICS_TOPIC,
+                "value_template": f"{{{{ value_json.{key} }}}}",
+                "availability_topic": AVAILABILITY_TOPIC,
+                "icon": icon,
+                "device": {"identifiers": [BRIDGE_DEVICE_ID]},
                 "entity_category": "diagnostic",
             }
-            await self._publish_async(topic, json.dumps(payload), retain=True, qos=1)
-        except Exception: pass
+            if unit:
+                payload["unit_of_measurement"] = unit
+            configs.append((self._ha_config_topic("sensor", oid), json_bytes(payload)))
+        return configs
 
-    async def _publish_all_discovery_async(self):
+    async def _publish_all_discovery_async(self, with_state: bool = False):
+        # The publisher task gathers the enqueued burst in batches
         await self._publish_bridge_device_async()
-        for l in self._loads.values():
-            await self._publish_discovery_for_load_async(l)
-            await self._publish_attributes_for_load_async(l)
+        self._publish_batch(self._iter_load_discovery_items(with_state))
 
-    async def _publish_discovery_for_load_async(self, load):
-        if not self._mqtt_connected: return
-        oid = self._obj_id_map.get(load.id)
-        if not oid: return
-        topic = self._ha_config_topic("light", oid)
+    def _iter_load_discovery_items(self, with_state: bool):
+        for l in self._loads.values():
+            entry = self._load_discovery_entry(l)
+            if entry:
+                yield entry[0], entry[1], 1, True
+            topic, payload = self._load_attributes_entry(l)
+            yield topic, payload, 1, True
+        # States follow all configs so the publisher flushes the QoS 1 run once, not per load
+        if with_state:
+            yield from self._iter_state_items((l.id, float(l.level or 0.0)) for l in self._loads.values())
+
+    def _build_load_discovery(self, load) -> Optional[Tuple[str, bytes]]:
+        topics = self._light_topics(load.id)
+        if not topics.config: return None
         safe_dev_id = f"vantage_{VANTAGE_HOST_SAFE}_load_{load.id}"
         payload = {
             "name": getattr(load, "name", f"Load {load.id}"),
             "unique_id": f"vantage_{VANTAGE_HOST}_load_{load.id}_light",
-            "state_topic": self._topic("light", load.id, "state"),
-            "command_topic": self._topic("light", load.id, "set"),
-            "brightness_state_topic": self._topic("light", load.id, "brightness", "state"),
-            "brightness_command_topic": self._topic("light", load.id, "brightness", "set"),
+            "state_topic": topics.state,
+            "command_topic": topics.set_,
+            "brightness_state_topic": topics.bri_state,
+            "brightness_command_topic": topics.bri_set,
             "brightness_scale": 255,
             "availability_topic": AVAILABILITY_TOPIC,
             "device": {
@@ -588,32 +1055,83 @@ class VantageBridge:
                 "via_device": BRIDGE_DEVICE_ID,
             },
         }
-        await self._publish_async(topic, json.dumps(payload), retain=True, qos=1)
+        return topics.config, json_bytes(payload)
 
-    async def _publish_attributes_for_load_async(self, load):
-        attr_topic = self._topic("light", load.id, "attributes")
+    def _build_load_attributes(self, load) -> Tuple[str, bytes]:
+        attr_topic = self._light_topics(load.id).attr
         attrs = { "vantage_area": self._get_area_name(load), "vantage_id": load.id, "vantage_name": getattr(load, "name", "load") }
-        await self._publish_async(attr_topic, json.dumps(attrs), retain=True, qos=1)
+        return attr_topic, json_bytes(attrs)
+
+    def _load_discovery_entry(self, load) -> Optional[Tuple[str, bytes]]:
+        entry = self._disc_cache.get(load.id)
+        if entry is None:
+            entry = self._build_load_discovery(load)
+            if entry: self._disc_cache[load.id] = entry
+        return entry
+
+    def _load_attributes_entry(self, load) -> Tuple[str, bytes]:
+        entry = self._attr_cache.get(load.id)
+        if entry is None:
+            entry = self._attr_cache[load.id] = self._build_load_attributes(load)
+        return entry
+
+    def _iter_state_items(self, levels: Iterable[Tuple[int, float]]):
+        for load_id, level in levels:
+            state = _B_ON if level > 0 else _B_OFF
+            bri = vantage_to_ha_brightness(level) if self._is_dimmable.get(load_id, True) else None
+            # Vantage re-fires unchanged levels and polls revisit every load; skip what HA already has
+            key = (state, bri)
+            if self._last_published.get(load_id) == key: continue
+            self._last_published[load_id] = key
+            topics = self._light_topics(load_id)
+            yield topics.state, state, 0, False
+            if bri is not None:
+                yield topics.bri_state, _BRI_PAYLOAD[bri], 0, False
+
+    async def _resync_home_assistant(self):
+        """HA restarted and lost all non-retained state: resend discovery followed by every load's state."""
+        log.info("Home Assistant came online; resending discovery and state.")
+        self._last_published.clear()
+        if self._loads:
+            await self._publish_all_discovery_async(with_state=True)
+
+    def _publish_load_states(self, levels: Iterable[Tuple[int, float]]):
+        """Enqueue state/brightness for many loads as one burst for the publisher task."""
+        self._publish_batch(self._iter_state_items(levels))
 
     async def _publish_load_state_async(self, load_id, level):
         if level is None: return
-        state_topic = self._topic("light", load_id, "state")
-        state = "ON" if level > 0 else "OFF"
-        await self._publish_async(state_topic, state)
-        if self._is_dimmable.get(load_id, True):
-            bt = self._topic("light", load_id, "brightness", "state")
-            await self._publish_async(bt, str(vantage_to_ha_brightness(level)))
+        self._publish_load_states(((load_id, level),))
+
+    def _sample_process(self) -> Tuple[float, int]:
+        """CPU % since the previous sample (0.0 on the first) and RSS bytes."""
+        if self._process is not None:
+            return self._process.cpu_percent(interval=None), self._process.memory_info().rss
+        stats = read_proc_stats()
+        if stats is None: return 0.0, 0
+        ticks, rss = stats
+        now = time.monotonic()
+        cpu = 0.0
+        if self._proc_prev is not None:
+            prev_ticks, prev_time = self._proc_prev
+            elapsed = now - prev_time
+            if elapsed > 0:
+                cpu = round((ticks - prev_ticks) / (elapsed * _CLK_TCK) * 100.0, 1)
+        self._proc_prev = (ticks, now)
+        return cpu, rss
 
     async def _publish_diagnostics_async(self):
         if not self._mqtt_connected: return
         try:
-            cpu = self._process.cpu_percent(interval=None)
-            mem = round(self._process.memory_info().rss / (1024 * 1024), 2)
-            await self._publish_async(self._topic("diagnostics", "cpu_usage_pct"), str(cpu))
-            await self._publish_async(self._topic("diagnostics", "memory_usage_mb"), str(mem))
-            await self._publish_async(self._topic("diagnostics", "uptime_s"), str(int(time.monotonic() - self._start_time)))
-            await self._publish_async(self._topic("diagnostics", "messages_published_total"), str(self._total_publishes))
-            await self._publish_async(self._topic("diagnostics", "entity_count"), str(len(self._loads)), retain=True)
+            cpu, rss = self._sample_process()
+            payload = {
+                "cpu_usage_pct": cpu,
+                "memory_usage_mb": round(rss / (1024 * 1024), 2),
+                "uptime_s": int(time.monotonic() - self._start_time),
+                "messages_published_total": self._total_publishes,
+                "entity_count": len(self._loads),
+            }
+            await self._publish_async(DIAGNOSTICS_TOPIC, json_bytes(payload), retain=True)
         except Exception: pass
 
     # ─────────────────────────────────────────────────────────────────────
@@ -624,48 +1142,56 @@ class VantageBridge:
         while not self._shutdown_requested:
             await asyncio.sleep(HEALTH_CHECK_INTERVAL)
             if self._mqtt_connected:
-                await self._publish_async(AVAILABILITY_TOPIC, "online", retain=True)
+                await self._publish_async(AVAILABILITY_TOPIC, _B_ONLINE, retain=True)
                 await self._publish_diagnostics_async()
 
-    async def _poll_loop(self):
+    async def _poll_on_trigger(self):
+        await asyncio.sleep(10) # Initial grace period
+
+        while not self._shutdown_requested:
+            # Sniper Trigger (Button Press)
+            await self._poll_trigger.wait()
+            log.info("Sniper Trigger Detected. Waiting 5s for scene to finish...")
+            self._poll_trigger.clear()
+
+            # Wait for the fade to complete
+            await asyncio.sleep(5)
+            await self._do_poll()
+
+    async def _poll_safety_net(self):
         log.info(f"Starting Smart Polling Loop (Interval: {POLL_INTERVAL}s).")
         await asyncio.sleep(10) # Initial grace period
 
         while not self._shutdown_requested:
-            try:
-                # WAIT FOR EITHER:
-                # 1. 90 seconds (Normal Loop)
-                # 2. Sniper Trigger (Button Press)
-                await asyncio.wait_for(self._poll_trigger.wait(), timeout=POLL_INTERVAL)
-                
-                # If we get here, the Sniper triggered!
-                log.info("Sniper Trigger Detected. Waiting 5s for scene to finish...")
-                self._poll_trigger.clear()
-                
-                # Wait for the fade to complete
-                await asyncio.sleep(5)
-                
-            except asyncio.TimeoutError:
-                # Normal 90s timeout - just continue to check
-                pass
+            await asyncio.sleep(POLL_INTERVAL)
+            await self._do_poll()
 
-            # Smart Check: Don't poll if we just got live data
-            time_since_activity = time.monotonic() - self._last_event_time
-            if time_since_activity < POLL_QUIET_TIME:
-                continue
+    async def _do_poll(self):
+        # Smart Check: Don't poll if we just got live data
+        time_since_activity = time.monotonic() - self._last_event_time
+        if time_since_activity < POLL_QUIET_TIME:
+            return
 
-            if self._vantage:
-                try:
-                    log.info("Running Update Poll...")
-                    await self._vantage.loads.fetch_state()
-                    self._last_event_time = time.monotonic()
-                    for load_obj in self._vantage.loads:
-                        if load_obj.level is not None:
-                            lvl = float(load_obj.level)
-                            if lvl > 0: self._last_non_zero_level[load_obj.id] = lvl
-                            await self._publish_load_state_async(load_obj.id, lvl)
-                except Exception as e:
-                    log.warning(f"Poll error: {e}")
+        # The trigger and safety-net loops can land together; one fetch is enough
+        if not self._vantage or self._poll_lock.locked():
+            return
+
+        async with self._poll_lock:
+            try:
+                log.info("Running Update Poll...")
+                await self._vantage.loads.fetch_state()
+                self._last_event_time = time.monotonic()
+                # Unchanged loads are filtered out by the last-published cache; HA restarts
+                # and MQTT reconnects clear it, so those still get a full resend
+                levels: List[Tuple[int, float]] = []
+                for load_obj in self._vantage.loads:
+                    if load_obj.level is not None:
+                        lvl = float(load_obj.level)
+                        if lvl > 0: self._last_non_zero_level[load_obj.id] = lvl
+                        levels.append((load_obj.id, lvl))
+                self._publish_load_states(levels)
+            except Exception as e:
+                log.warning(f"Poll error: {e}")
 
     # ─────────────────────────────────────────────────────────────────────
     # Run
@@ -678,6 +1204,7 @@ class VantageBridge:
             except NotImplementedError: pass
 
         self._mqtt_task = self._loop.create_task(self._mqtt_loop())
+        self._publisher_task = self._loop.create_task(self._publisher_loop())
 
         while not self._shutdown_requested:
             try:
@@ -692,6 +1219,7 @@ class VantageBridge:
                     self._subscribe_to_load_events()
 
                     # Start Keypad Bridge (Pass Poll Trigger!)
+                    if self._keypad_bridge: await self._keypad_bridge.stop()
                     self._keypad_bridge = KeypadEventsBridge(
                         vantage,
                         self.get_mqtt_client,
@@ -700,12 +1228,15 @@ class VantageBridge:
                         DISCOVERY_PREFIX,
                         learn_mode=True,
                         publish_raw=True,
+                        area_map=self._area_names,
                     )
                     await self._keypad_bridge.start()
 
                     if not self._health_task: self._health_task = self._loop.create_task(self._health_check_loop())
-                    if ENABLE_FALLBACK_POLLING and not self._poll_task: self._poll_task = self._loop.create_task(self._poll_loop())
-                    if self._mqtt_connected: await self._publish_async(AVAILABILITY_TOPIC, "online", retain=True, qos=1)
+                    if ENABLE_FALLBACK_POLLING and not self._poll_task:
+                        self._poll_task = self._loop.create_task(self._poll_on_trigger())
+                        self._poll_safety_task = self._loop.create_task(self._poll_safety_net())
+                    if self._mqtt_connected: await self._publish_async(AVAILABILITY_TOPIC, _B_ONLINE, retain=True, qos=1)
 
                     while not self._shutdown_requested: await asyncio.sleep(1)
 
@@ -719,11 +1250,13 @@ class VantageBridge:
         if self._shutdown_requested: return
         self._shutdown_requested = True
         log.info("Shutdown requested.")
-        for task in (self._health_task, self._poll_task, self._mqtt_task):
+        for task in (self._health_task, self._poll_task, self._poll_safety_task, *self._level_tasks,
+                     self._publisher_task, self._mqtt_task):
             if task:
                 task.cancel()
                 try: await task
                 except asyncio.CancelledError: pass
+        if self._keypad_bridge: await self._keypad_bridge.stop()
         await self._publish_bridge_offline_async()
         log.info("Bridge stopped.")
 
@@ -734,5 +1267,7 @@ async def main():
         if not bridge._shutdown_requested: await bridge.stop()
 
 if __name__ == "__main__":
-    try: asyncio.run(main())
+    # libuv event loop when available; the asyncio API is the same either way
+    run = uvloop.run if uvloop is not None else asyncio.run
+    try: run(main())
     except KeyboardInterrupt: pass